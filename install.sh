@@ -43,7 +43,10 @@ if [ -z "$existing_key" ]; then
         exit 1
     fi
     
-    echo "$api_key" > "$api_key_file"
+    # Create the key file owner-only from the start (umask applies only to
+    # new files, so replace any older world-readable copy)
+    rm -f "$api_key_file"
+    (umask 077 && echo "$api_key" > "$api_key_file")
     echo "✅ API key saved"
 fi
 
@@ -196,6 +199,14 @@ python3 -m venv venv
 ./venv/bin/pip install --quiet --upgrade pip
 ./venv/bin/pip install --quiet openai
 
+echo "Compiling AppleScripts..."
+# Precompiled scripts skip parsing on every event; create_event.py falls back
+# to the .applescript source if one fails (e.g. Fantastical not installed)
+for script in calendar_event fantastical_event; do
+    rm -f "$script.scpt"
+    osacompile -o "$script.scpt" "$script.applescript" 2>/dev/null || echo "⚠️  Could not compile $script.applescript"
+done
+
 echo "Creating workflow package..."
 cd ..
 python3 workflow/package_workflow.py
@@ -2,6 +2,7 @@
 
 # FOCAL AI-Powered Release Script
 # Analyzes changes, determines version, embeds it, commits, tags, and pushes
+# Usage: ./release.sh [--ai]   (--ai asks OpenAI instead of commit-message rules)
 
 set -e
 
@@ -20,7 +21,12 @@ if ! git diff --quiet HEAD || ! git diff --quiet --cached; then
     exit 1
 fi
 
-echo "🔍 Analyzing changes with AI..."
+use_ai="False"
+if [ "$1" = "--ai" ]; then
+    use_ai="True"
+fi
+
+echo "🔍 Analyzing changes..."
 
 # Ensure build environment exists
 if [ ! -d "build-venv" ]; then
@@ -29,25 +35,23 @@ if [ ! -d "build-venv" ]; then
     ./build-venv/bin/pip install --quiet openai
 fi
 
-./build-venv/bin/python3 version.py
-
-# Get the AI recommendation
+# Get the version recommendation
 version_output=$(./build-venv/bin/python3 -c "
 import sys
 from version import get_next_version
-result = get_next_version()
+result = get_next_version(use_ai=$use_ai)
 print(f'DATA:{result[\"next_version\"]}|{result[\"bump_type\"]}|{result[\"reasoning\"]}', file=sys.stderr)
 " 2>&1 >/dev/null | grep "^DATA:" | sed 's/^DATA://')
 
 if [ -z "$version_output" ]; then
-    echo "❌ Failed to get AI recommendation"
+    echo "❌ Failed to get version recommendation"
     exit 1
 fi
 
 IFS='|' read -r next_version bump_type reasoning <<< "$version_output"
 
 echo ""
-echo "🎯 AI Recommendation:"
+echo "🎯 Recommendation:"
 echo "   Next version: $next_version ($bump_type bump)"
 echo "   Reasoning: $reasoning"
 echo ""
@@ -1,68 +1,73 @@
 #!/usr/bin/env python3
 """
-AI-Powered Semantic Versioning for FOCAL
-Analyzes git changes and uses OpenAI to determine the next version.
+Semantic Versioning for FOCAL
+Analyzes git changes with commit-message rules (or OpenAI with --ai) to
+determine the next version.
 """
 
 import subprocess
+import sys
 import re
 import json
 from pathlib import Path
-from openai import OpenAI
+
+# Conventional-commit markers, matched against commit subjects; the
+# BREAKING CHANGE token is uppercase by convention, so prose like
+# "non-breaking change" must not match
+BREAKING_RE = re.compile(r'^\w+(\([^)]*\))?!:|\bBREAKING[ -]CHANGE\b')
+FEATURE_RE = re.compile(r'^feat(\([^)]*\))?:', re.IGNORECASE)
+VERSION_RE = re.compile(r'\d+\.\d+\.\d+')
+
+KEY_FILE = Path(__file__).parent / 'workflow' / '.openai_key'
+
+GIT_LATEST_TAG = ('describe', '--tags', '--abbrev=0')
+GIT_RECENT_LOG = ('log', '--oneline', '--no-merges', '--since="1 week ago"')
+GIT_LAST_LOG = ('log', '--oneline', '--no-merges', '-10')
+GIT_FILE_CHANGES = ('diff', '--name-status', 'HEAD~5..HEAD')
 
 def get_openai_key():
     """Get OpenAI API key from workflow/.openai_key file."""
-    key_file = Path(__file__).parent / 'workflow' / '.openai_key'
-    if not key_file.exists():
+    try:
+        return KEY_FILE.read_text().strip()
+    except FileNotFoundError:
         raise FileNotFoundError("OpenAI API key not found. Run install.sh first.")
-    return key_file.read_text().strip()
 
-def get_current_version():
-    """Get current version from git tags or default to 1.0.0."""
-    try:
-        # Get latest tag
-        result = subprocess.run(
-            ['git', 'describe', '--tags', '--abbrev=0'],
-            capture_output=True, text=True, check=True
-        )
-        tag = result.stdout.strip()
-        # Extract version from tag (handles v1.0.0 or 1.0.0)
-        match = re.search(r'(\d+\.\d+\.\d+)', tag)
-        return match.group(1) if match else "1.0.0"
-    except subprocess.CalledProcessError:
-        return "1.0.0"
-
-def get_changes_since_last_tag():
-    """Get all commits since the last tag."""
-    try:
-        # Try to get commits since last tag
-        result = subprocess.run(
-            ['git', 'log', '--oneline', '--no-merges', '--since="1 week ago"'],
-            capture_output=True, text=True, check=True
-        )
-        if not result.stdout.strip():
-            # If no recent commits, get last few commits
-            result = subprocess.run(
-                ['git', 'log', '--oneline', '--no-merges', '-10'],
-                capture_output=True, text=True, check=True
-            )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
+def run_git_commands(*commands):
+    """Run git commands concurrently; return stdout for each, or None on failure."""
+    # Start every process before waiting on any so their startup overlaps
+    procs = [
+        subprocess.Popen(['git', *command], stdout=subprocess.PIPE,
+                         stderr=subprocess.DEVNULL, text=True)
+        for command in commands
+    ]
+    outputs = []
+    for proc in procs:
+        stdout, _ = proc.communicate()
+        outputs.append(stdout.strip() if proc.returncode == 0 else None)
+    return outputs
+
+def version_from_tag(tag):
+    """Extract version from tag (handles v1.0.0 or 1.0.0), default 1.0.0."""
+    match = VERSION_RE.search(tag or '')
+    return match.group() if match else "1.0.0"
+
+def select_changes(recent_log, last_log):
+    """Prefer commits from the last week, else the last few commits."""
+    if recent_log is None or last_log is None:
         return "No git history available"
+    return recent_log or last_log
 
-def get_file_changes():
-    """Get summary of changed files."""
-    try:
-        result = subprocess.run(
-            ['git', 'diff', '--name-status', 'HEAD~5..HEAD'],
-            capture_output=True, text=True, check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
-        return "No file changes detected"
+def extract_json_object(text):
+    """Decode the first JSON object in text, including nested braces."""
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("No valid JSON found in OpenAI response")
+    obj, _ = json.JSONDecoder().raw_decode(text, start)
+    return obj
 
 def ask_openai_for_version(current_version, changes, file_changes):
     """Use OpenAI to analyze changes and suggest next version."""
+    from openai import OpenAI
     client = OpenAI(api_key=get_openai_key())
     
     prompt = f"""
@@ -99,11 +104,7 @@ Respond with ONLY a JSON object:
         
         result_text = response.choices[0].message.content.strip()
         # Extract JSON from response
-        json_match = re.search(r'\{[^}]+\}', result_text, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group())
-        else:
-            raise ValueError("No valid JSON found in OpenAI response")
+        return extract_json_object(result_text)
             
     except Exception as e:
         print(f"OpenAI API error: {e}")
@@ -127,27 +128,63 @@ def increment_version(current_version, bump_type):
     else:  # patch
         return f"{major}.{minor}.{patch + 1}"
 
-def get_next_version():
-    """Main function to get the next version using AI analysis."""
-    current_version = get_current_version()
-    changes = get_changes_since_last_tag()
-    file_changes = get_file_changes()
+def classify_changes(current_version, changes):
+    """Pick the bump type from commit subjects using conventional-commit rules."""
+    breaking = features = 0
+    for line in changes.splitlines():
+        # --oneline output is "<hash> <subject>"
+        subject = line.split(' ', 1)[-1].strip()
+        if BREAKING_RE.search(subject):
+            breaking += 1
+        elif FEATURE_RE.search(subject):
+            features += 1
+    
+    if breaking:
+        bump_type = "major"
+        reasoning = f"{breaking} breaking change(s) found in commit messages"
+    elif features:
+        bump_type = "minor"
+        reasoning = f"{features} new feature(s), no breaking changes"
+    else:
+        bump_type = "patch"
+        reasoning = "No features or breaking changes, treating as fixes"
+    
+    return {
+        "next_version": increment_version(current_version, bump_type),
+        "bump_type": bump_type,
+        "reasoning": reasoning
+    }
+
+def get_next_version(use_ai=False):
+    """Main function to get the next version, optionally using AI analysis."""
+    # Fetch everything up front in one concurrent batch of git processes
+    commands = [GIT_LATEST_TAG, GIT_RECENT_LOG, GIT_LAST_LOG]
+    if use_ai:
+        commands.append(GIT_FILE_CHANGES)
+    tag, recent_log, last_log, *extra = run_git_commands(*commands)
+    
+    current_version = version_from_tag(tag)
+    changes = select_changes(recent_log, last_log)
     
     print(f"Current version: {current_version}")
     print(f"Analyzing {len(changes.splitlines())} recent commits...")
     
-    # Get AI recommendation
-    ai_result = ask_openai_for_version(current_version, changes, file_changes)
+    if use_ai:
+        file_changes = extra[0] if extra[0] is not None else "No file changes detected"
+        result = ask_openai_for_version(current_version, changes, file_changes)
+        print(f"AI Analysis:")
+    else:
+        result = classify_changes(current_version, changes)
+        print("Commit Analysis:")
     
-    print(f"AI Analysis:")
-    print(f"  Recommended: {ai_result['next_version']} ({ai_result['bump_type']} bump)")
-    print(f"  Reasoning: {ai_result['reasoning']}")
+    print(f"  Recommended: {result['next_version']} ({result['bump_type']} bump)")
+    print(f"  Reasoning: {result['reasoning']}")
     
-    return ai_result
+    return result
 
 if __name__ == "__main__":
     try:
-        result = get_next_version()
+        result = get_next_version(use_ai='--ai' in sys.argv[1:])
         print(f"\nNext version: {result['next_version']}")
     except Exception as e:
         print(f"Error: {e}")
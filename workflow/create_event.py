@@ -8,67 +8,24 @@ import sys
 import os
 import subprocess
 import logging
+import re
+import io
 import json
+import time
+import functools
 from datetime import datetime, timedelta
 
-def setup_logging():
-    """Setup detailed logging for debugging."""
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()]
-    )
-    return logging.getLogger(__name__)
+WORKFLOW_DIR = os.path.dirname(os.path.abspath(__file__))
 
-def get_api_key():
-    """Get OpenAI API key from .openai_key file."""
-    key_file = os.path.join(os.path.dirname(__file__), '.openai_key')
-    try:
-        with open(key_file, 'r') as f:
-            return f.read().strip()
-    except (FileNotFoundError, IOError):
-        return None
+# Default model; override with a .openai_model file
+OPENAI_MODEL = "gpt-4o-mini"
 
-def get_calendar_app():
-    """Get preferred calendar app from config file."""
-    config_file = os.path.join(os.path.dirname(__file__), '.calendar_app')
-    try:
-        with open(config_file, 'r') as f:
-            app = f.read().strip().lower()
-            return 'fantastical' if app == 'fantastical' else 'calendar'
-    except (FileNotFoundError, IOError):
-        return 'calendar'  # Default to Apple Calendar
+SYSTEM_PROMPT = "You are an expert at extracting structured calendar event data from natural language. Always return valid JSON."
 
-def get_target_calendar():
-    """Get target calendar name from config file."""
-    config_file = os.path.join(os.path.dirname(__file__), '.target_calendar')
-    try:
-        with open(config_file, 'r') as f:
-            calendar_name = f.read().strip()
-            return calendar_name if calendar_name else 'Calendar'
-    except (FileNotFoundError, IOError):
-        return 'Calendar'  # Default to 'Calendar'
+# Schema and rules for extraction, no interpolation
+EXTRACTION_RULES = """Extract event information from the user's natural language request and return JSON with these exact fields:
 
-def create_extraction_prompt(user_input):
-    """Create prompt for OpenAI to extract structured event data."""
-    from datetime import datetime, timedelta
-    
-    now = datetime.now()
-    today = now.strftime("%Y-%m-%d")
-    tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-    day_after = (now + timedelta(days=2)).strftime("%Y-%m-%d")
-    current_time = now.strftime("%H:%M")
-    current_weekday = now.strftime("%A")
-    
-    # Calculate next week days for reference
-    days_from_now = {}
-    for i in range(1, 8):
-        future_date = now + timedelta(days=i)
-        days_from_now[future_date.strftime("%A").lower()] = future_date.strftime("%Y-%m-%d")
-    
-    return f"""Extract event information from this natural language request and return JSON with these exact fields:
-
-{{
+{
     "title": "event title",
     "start_date": "YYYY-MM-DD",
     "end_date": "YYYY-MM-DD", 
@@ -78,7 +35,7 @@ def create_extraction_prompt(user_input):
     "location": "location or null",
     "notes": "additional notes or null",
     "recurrence": "daily|weekly|monthly|yearly|null"
-}}
+}
 
 RULES FOR ALL-DAY EVENTS:
 - Date range patterns like "24-30 August", "Aug 20-25", "June 1-7" → all_day: true
@@ -90,15 +47,177 @@ RULES FOR ALL-DAY EVENTS:
 RULES FOR TIMED EVENTS:
 - Specific times mentioned → use those times, all_day: false
 - Time mentioned without date (e.g., "at 17:00", "catch up at 5pm"):
-  * If the specified time is LATER than current time ({current_time}), use TODAY ({today})
-  * If the specified time has ALREADY PASSED today, use TOMORROW ({tomorrow})
-  * Example: Current time {current_time}, "catch up at 17:00" → use {today} if 17:00 > {current_time}
-- No time specified → default to current time ({current_time}) on appropriate date
+  * If the specified time is LATER than the current time, use TODAY
+  * If the specified time has ALREADY PASSED today, use TOMORROW
+  * Example: Current time 16:00, "catch up at 17:00" → use today's date because 17:00 > 16:00
+- No time specified → default to the current time on appropriate date
 - If no end time, default to 1 hour after start
 - For recurring events, set recurrence field appropriately
 - Use null for empty fields, not empty strings
 
-DATE CONTEXT (IMPORTANT - USE THESE EXACT DATES):
+Today, tomorrow and the current time are given in the DATE CONTEXT of each request."""
+
+# The rules live in the system message, which is byte-identical on every
+# call so OpenAI serves it from its prompt cache; only the user message varies
+SYSTEM_MESSAGE = f"{SYSTEM_PROMPT}\n\n{EXTRACTION_RULES}"
+
+# Response budget for one extracted event object
+MAX_TOKENS_PER_EVENT = 300
+
+# Batch API polling: start fast, back off to a few minutes between checks
+BATCH_POLL_INITIAL_SECONDS = 5
+BATCH_POLL_MAX_SECONDS = 300
+BATCH_FINAL_STATES = ('completed', 'failed', 'expired', 'cancelled')
+
+# Events created at once when several are given; more risks a LaunchServices storm
+MAX_CONCURRENT_EVENTS = 4
+
+# Absolute path plus close_fds=False lets subprocess use posix_spawn on macOS
+# instead of fork/exec, which would copy the page tables of a process that
+# may have openai loaded. Python's own fds are non-inheritable regardless.
+OSASCRIPT = '/usr/bin/osascript'
+
+# How long to wait for the background app launch before creating events anyway
+APP_LAUNCH_TIMEOUT = 10
+
+# Backslashes are dropped and double quotes become single quotes
+SANITIZE_TABLE = str.maketrans({'\\': None, '"': "'"})
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+# Fast path for the common "<title> <day> [at] <time>" phrasing, e.g.
+# "Lunch with Sarah tomorrow at 12:30pm" or "Standup every Monday 9am"
+SIMPLE_EVENT_RE = re.compile(
+    r'^(?P<title>.+?)\s+(?:on\s+)?'
+    r'(?:(?P<every>every)\s+)?(?P<day>today|tomorrow|' + '|'.join(WEEKDAYS) + r')\s+'
+    r'(?:at\s+)?(?:(?P<noon>noon)|(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?)$',
+    re.IGNORECASE
+)
+
+# Titles containing these need the model (locations, ranges, durations)
+AMBIGUOUS_TITLE_RE = re.compile(r'\d|@|\b(?:at|in|from|to|until|for|every|next|this)\b', re.IGNORECASE)
+
+# Descriptions relative to the current time of day; their extraction is not cached
+TIME_RELATIVE_RE = re.compile(
+    r'\b(?:now|later|soon|in\s+(?:an?|\d+|half\s+an?)\s*(?:min|minutes?|hours?|hrs?|h)\b)',
+    re.IGNORECASE
+)
+
+# Shapes the model may return (same as strptime's '%Y-%m-%d' and '%H:%M',
+# which allow unpadded fields); fromisoformat alone also accepts compact
+# dates, seconds and UTC offsets but needs zero-padded fields
+DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+TIME_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
+def setup_logging():
+    """Setup detailed logging for debugging."""
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()]
+    )
+    return logging.getLogger(__name__)
+
+def read_small_file(filename):
+    """Read a small file from the workflow directory as text."""
+    # Raw os.read skips the buffered reader and text decoder layers, which
+    # cost more than the read itself for files this size
+    fd = os.open(os.path.join(WORKFLOW_DIR, filename), os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b''.join(chunks).decode('utf-8')
+
+def read_config_file(filename):
+    """Read a single config file from the workflow directory."""
+    try:
+        return read_small_file(filename).strip()
+    except (FileNotFoundError, IOError, UnicodeDecodeError):
+        return None
+
+@functools.lru_cache(maxsize=1)
+def load_config():
+    """Load configuration once, preferring the packaged .focal.json."""
+    try:
+        return json.loads(read_small_file('.focal.json'))
+    except (FileNotFoundError, IOError, ValueError):
+        pass
+    # Fall back to the individual files written by install.sh
+    return {
+        'api_key': read_config_file('.openai_key'),
+        'calendar_app': read_config_file('.calendar_app'),
+        'target_calendar': read_config_file('.target_calendar'),
+        'model': read_config_file('.openai_model'),
+    }
+
+def get_api_key():
+    """Get OpenAI API key from configuration."""
+    return load_config().get('api_key') or None
+
+def get_calendar_app():
+    """Get preferred calendar app from configuration."""
+    app = (load_config().get('calendar_app') or '').lower()
+    return 'fantastical' if app == 'fantastical' else 'calendar'  # Default to Apple Calendar
+
+def get_target_calendar():
+    """Get target calendar name from configuration."""
+    return load_config().get('target_calendar') or 'Calendar'  # Default to 'Calendar'
+
+def get_model():
+    """Get the OpenAI model from configuration."""
+    return load_config().get('model') or OPENAI_MODEL
+
+def create_extraction_prompt(user_input):
+    """Create prompt for OpenAI to extract structured event data."""
+    return build_extraction_prompt(f'''Request: "{user_input}"
+
+Return ONLY the JSON object:''')
+
+def create_batch_extraction_prompt(user_inputs):
+    """Create one prompt that extracts several events in a single request."""
+    numbered = "\n".join(f'{i}. "{text}"' for i, text in enumerate(user_inputs, 1))
+    return build_extraction_prompt(f'''Requests:
+{numbered}
+
+Return ONLY a JSON object of the form {{"events": [...]}} containing one event object per request, in the same order:''')
+
+@functools.lru_cache(maxsize=1)
+def get_days_from_now(today):
+    """Map each weekday name to its date over the next seven days."""
+    days_from_now = {}
+    for i in range(1, 8):
+        future_date = today + timedelta(days=i)
+        days_from_now[WEEKDAYS[future_date.weekday()]] = future_date.isoformat()
+    return days_from_now
+
+def build_extraction_prompt(request_section):
+    """Prefix the request section with the current date context."""
+    # The context only shows minutes, so it is rebuilt at most once a minute
+    # (Batch API runs build one prompt per description)
+    return f"""{get_date_context(datetime.now().replace(second=0, microsecond=0))}
+
+{request_section}"""
+
+@functools.lru_cache(maxsize=1)
+def get_date_context(now):
+    """Describe today, tomorrow and the coming weekdays for the prompt."""
+    # Plain formatting and WEEKDAYS avoid strftime's locale-aware %A
+    today = now.date().isoformat()
+    tomorrow = (now + timedelta(days=1)).date().isoformat()
+    day_after = (now + timedelta(days=2)).date().isoformat()
+    current_time = f"{now.hour:02d}:{now.minute:02d}"
+    current_weekday = WEEKDAYS[now.weekday()].capitalize()
+    
+    # Next week days for reference, computed once per day
+    days_from_now = get_days_from_now(now.date())
+    
+    return f"""DATE CONTEXT (IMPORTANT - USE THESE EXACT DATES):
 - Current time is {current_time} on {current_weekday}, {today}
 - Tomorrow is {tomorrow}
 - Day after tomorrow is {day_after}
@@ -106,50 +225,209 @@ DATE CONTEXT (IMPORTANT - USE THESE EXACT DATES):
 - Next {days_from_now.get('tuesday', 'N/A')} is Tuesday
 - Next {days_from_now.get('wednesday', 'N/A')} is Wednesday
 - Next {days_from_now.get('thursday', 'N/A')} is Thursday
-- Next {days_from_now.get('friday', 'N/A')} is Friday
+- Next {days_from_now.get('friday', 'N/A')} is Friday"""
 
-Request: "{user_input}"
+def fast_parse_event(user_input, now=None):
+    """Parse simple "<title> <day> <time>" inputs locally, or return None."""
+    match = SIMPLE_EVENT_RE.match(user_input)
+    if not match:
+        return None
+    
+    title = match.group('title').strip()
+    if not title or AMBIGUOUS_TITLE_RE.search(title):
+        return None
+    
+    if match.group('noon'):
+        hour, minute = 12, 0
+    else:
+        hour = int(match.group('hour'))
+        minute = int(match.group('minute') or 0)
+        ampm = (match.group('ampm') or '').lower()
+        if ampm:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if ampm == 'pm' else 0)
+        elif match.group('minute') is None:
+            # A bare "3" could be 3am or 3pm; let the model decide
+            return None
+        if hour > 23 or minute > 59:
+            return None
+    
+    now = now or datetime.now()
+    day = match.group('day').lower()
+    if day == 'today':
+        offset = 0
+    elif day == 'tomorrow':
+        offset = 1
+    else:
+        offset = (WEEKDAYS.index(day) - now.weekday()) % 7
+        if offset == 0:
+            # "Wednesday" said on a Wednesday could mean today or next week
+            return None
+    
+    start = (now + timedelta(days=offset)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+    end = start + timedelta(hours=1)
+    
+    return {
+        'title': title[0].upper() + title[1:],
+        'start_date': start.strftime('%Y-%m-%d'),
+        'end_date': end.strftime('%Y-%m-%d'),
+        'all_day': False,
+        'start_time': start.strftime('%H:%M'),
+        'end_time': end.strftime('%H:%M'),
+        'location': None,
+        'notes': None,
+        'recurrence': 'weekly' if match.group('every') else None
+    }
+
+@functools.lru_cache(maxsize=1)
+def get_openai_client(api_key):
+    """Create the OpenAI client once and reuse it for later calls."""
+    # Imported here so cached and locally parsed events never load openai
+    import openai
+    return openai.OpenAI(api_key=api_key)
 
-Return ONLY the JSON object:"""
+def build_completion_request(prompt, event_count=1):
+    """Build the chat completion parameters for an extraction prompt."""
+    return {
+        "model": get_model(),
+        "messages": [
+            {"role": "system", "content": SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": MAX_TOKENS_PER_EVENT * event_count,
+        "temperature": 0.1,
+        # JSON mode: the reply is always a bare JSON object, never fenced
+        "response_format": {"type": "json_object"}
+    }
 
-def extract_event_data(prompt, api_key, logger):
-    """Call OpenAI API to extract structured event data."""
+def extract_event_data(prompt, api_key, logger, event_count=1):
+    """Call OpenAI API to extract structured event data; API errors propagate to the caller."""
+    client = get_openai_client(api_key)
+    
+    logger.info("Sending extraction prompt to OpenAI")
+    logger.debug(f"Full prompt: {prompt}")
+    
+    response = client.chat.completions.create(**build_completion_request(prompt, event_count))
+    
+    json_response = response.choices[0].message.content.strip()
+    logger.info("Received JSON response from OpenAI")
+    logger.info(f"🔍 OPENAI EXTRACTED JSON: {json_response}")
+    
+    return json_response
+
+def submit_batch(user_inputs, api_key, logger):
+    """Upload one extraction request per input to the OpenAI Batch API."""
+    client = get_openai_client(api_key)
+    
+    lines = []
+    for i, user_input in enumerate(user_inputs):
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": build_completion_request(create_extraction_prompt(user_input))
+        }))
+    
+    batch_file = io.BytesIO("\n".join(lines).encode('utf-8'))
+    batch_file.name = "focal_batch.jsonl"
+    uploaded = client.files.create(file=batch_file, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info(f"📤 Submitted batch {batch.id} with {len(user_inputs)} requests")
+    return batch.id
+
+def poll_batch(batch_id, api_key, logger):
+    """Wait for a batch job to finish, backing off between checks."""
+    client = get_openai_client(api_key)
+    delay = BATCH_POLL_INITIAL_SECONDS
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in BATCH_FINAL_STATES:
+            logger.info(f"Batch {batch_id} finished with status: {batch.status}")
+            return batch
+        logger.info(f"⏳ Batch {batch_id} is {batch.status}, checking again in {delay}s")
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+
+def extract_with_batch_api(user_inputs, api_key, logger):
+    """Extract events via the Batch API; returns event data per input (None on failure)."""
     try:
-        import openai
-        client = openai.OpenAI(api_key=api_key)
-        
-        logger.info("Sending extraction prompt to OpenAI")
-        logger.debug(f"Full prompt: {prompt}")
-        
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert at extracting structured calendar event data from natural language. Always return valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300,
-            temperature=0.1
-        )
-        
-        json_response = response.choices[0].message.content.strip()
-        logger.info("Received JSON response from OpenAI")
-        logger.info(f"🔍 OPENAI EXTRACTED JSON: {json_response}")
-        
-        return json_response
+        batch_id = submit_batch(user_inputs, api_key, logger)
+        batch = poll_batch(batch_id, api_key, logger)
+        if batch.status != 'completed' or not batch.output_file_id:
+            logger.error(f"Batch {batch_id} did not complete: {batch.status}")
+            return None
+        output = get_openai_client(api_key).files.content(batch.output_file_id).text
     except Exception as e:
-        logger.error(f"OpenAI API call failed: {str(e)}")
+        logger.error(f"OpenAI batch request failed: {str(e)}")
+        return None
+    
+    events = [None] * len(user_inputs)
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        # A malformed line (or a refusal with null content) loses only its own
+        # event; the slot stays None and is counted as a failure
+        try:
+            result = json.loads(line)
+            response = result.get('response') or {}
+            if response.get('status_code') != 200:
+                logger.error(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                continue
+            index = int(result['custom_id'])
+            if not 0 <= index < len(events):
+                raise IndexError(f"custom_id {index} out of range")
+            json_response = response['body']['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+            logger.error(f"Could not read batch result line: {str(e)}")
+            logger.debug(f"Raw batch line: {line}")
+            continue
+        logger.info(f"🔍 OPENAI EXTRACTED JSON: {json_response}")
+        events[index] = parse_and_validate_event_data(json_response, logger)
+    return events
+
+def load_json_response(json_response, logger):
+    """Decode a JSON response from OpenAI."""
+    try:
+        data = json.loads(json_response)
+        logger.info("Successfully parsed JSON response")
+        return data
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON response: {str(e)}")
+        logger.debug(f"Raw response: {json_response}")
         return None
 
 def parse_and_validate_event_data(json_response, logger):
     """Parse and validate the JSON event data from OpenAI."""
+    event_data = load_json_response(json_response, logger)
+    if event_data is None:
+        return None
+    return validate_event_data(event_data, logger)
+
+def parse_and_validate_batch_event_data(json_response, expected_count, logger):
+    """Parse and validate a {"events": [...]} batch response from OpenAI."""
+    data = load_json_response(json_response, logger)
+    if data is None:
+        return None
+    
+    events = data.get('events') if isinstance(data, dict) else None
+    if not isinstance(events, list) or len(events) != expected_count:
+        logger.error(f"Expected {expected_count} events in batch response")
+        return None
+    
+    validated = [validate_event_data(event_data, logger) for event_data in events]
+    return validated if all(validated) else None
+
+def validate_event_data(event_data, logger):
+    """Validate a single extracted event, normalizing all-day times."""
     try:
-        # Clean up response - remove any markdown code blocks
-        if json_response.startswith('```'):
-            lines = json_response.split('\n')
-            json_response = '\n'.join(lines[1:-1])
-        
-        event_data = json.loads(json_response)
-        logger.info("Successfully parsed JSON response")
+        if not isinstance(event_data, dict):
+            logger.error("Event data must be a JSON object")
+            return None
         
         # Validate required fields
         required_fields = ['title', 'start_date', 'end_date', 'all_day']
@@ -163,14 +441,6 @@ def parse_and_validate_event_data(json_response, logger):
             logger.error(f"all_day field must be boolean")
             return None
         
-        # Validate date formats
-        try:
-            datetime.strptime(event_data['start_date'], '%Y-%m-%d')
-            datetime.strptime(event_data['end_date'], '%Y-%m-%d')
-        except ValueError as e:
-            logger.error(f"Invalid date format: {str(e)}")
-            return None
-        
         # Validate time fields based on all_day
         if event_data['all_day']:
             # All-day events should have null times
@@ -183,66 +453,84 @@ def parse_and_validate_event_data(json_response, logger):
             if not event_data.get('start_time') or not event_data.get('end_time'):
                 logger.error("Timed event missing start_time or end_time")
                 return None
-            try:
-                datetime.strptime(event_data['start_time'], '%H:%M')
-                datetime.strptime(event_data['end_time'], '%H:%M')
-            except ValueError as e:
-                logger.error(f"Invalid time format: {str(e)}")
+        
+        # Validate date and time formats
+        for field in ('start_date', 'end_date'):
+            match = isinstance(event_data[field], str) and DATE_RE.fullmatch(event_data[field])
+            if not match:
+                logger.error(f"Invalid date format for {field}: {event_data[field]!r}")
                 return None
+            # Zero-pad so fromisoformat and later string comparisons agree
+            year, month, day = match.groups()
+            event_data[field] = f"{year}-{int(month):02d}-{int(day):02d}"
+        if not event_data['all_day']:
+            for field in ('start_time', 'end_time'):
+                match = isinstance(event_data[field], str) and TIME_RE.fullmatch(event_data[field])
+                if not match:
+                    logger.error(f"Invalid time format for {field}: {event_data[field]!r}")
+                    return None
+                hour, minute = match.groups()
+                event_data[field] = f"{int(hour):02d}:{minute}"
+        try:
+            event_datetimes(event_data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid date or time format: {str(e)}")
+            return None
         
         logger.info("Event data validation successful")
         return event_data
         
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON response: {str(e)}")
-        logger.debug(f"Raw response: {json_response}")
-        return None
     except Exception as e:
         logger.error(f"Unexpected error validating event data: {str(e)}")
         return None
 
+def event_datetimes(event_data):
+    """Return an event's start and end datetimes (midnight for all-day events)."""
+    # fromisoformat is implemented in C; strptime interprets a format string
+    if event_data['all_day']:
+        return (datetime.fromisoformat(event_data['start_date']),
+                datetime.fromisoformat(event_data['end_date']))
+    return (datetime.fromisoformat(f"{event_data['start_date']}T{event_data['start_time']}"),
+            datetime.fromisoformat(f"{event_data['end_date']}T{event_data['end_time']}"))
+
 def create_fantastical_string(event_data, target_calendar, logger):
     """Generate reliable Fantastical natural language string from structured data."""
     try:
-        from datetime import datetime
-        
         title = event_data['title']
+        start_dt, end_dt = event_datetimes(event_data)
         
         if event_data['all_day']:
             # All-day events: "BTGHP Week 5 from August 24 to August 30"
-            start_dt = datetime.strptime(event_data['start_date'], '%Y-%m-%d')
-            end_dt = datetime.strptime(event_data['end_date'], '%Y-%m-%d')
-            
             if event_data['start_date'] == event_data['end_date']:
                 # Single day all-day: "BTGHP Week 5 on August 24, 2025"
-                event_string = f"{title} on {start_dt.strftime('%B %d, %Y')}"
+                parts = [title, 'on', start_dt.strftime('%B %d, %Y')]
             else:
                 # Multi-day all-day: "BTGHP Week 5 from August 24 to August 30, 2025"
                 if start_dt.year == end_dt.year and start_dt.month == end_dt.month:
-                    event_string = f"{title} from {start_dt.strftime('%B %d')} to {end_dt.strftime('%d, %Y')}"
+                    parts = [title, 'from', start_dt.strftime('%B %d'), 'to', end_dt.strftime('%d, %Y')]
                 else:
-                    event_string = f"{title} from {start_dt.strftime('%B %d')} to {end_dt.strftime('%B %d, %Y')}"
+                    parts = [title, 'from', start_dt.strftime('%B %d'), 'to', end_dt.strftime('%B %d, %Y')]
         else:
             # Timed events: "Meeting on August 17, 2025 at 2:00 PM to 3:00 PM"
-            start_dt = datetime.strptime(f"{event_data['start_date']} {event_data['start_time']}", '%Y-%m-%d %H:%M')
-            end_dt = datetime.strptime(f"{event_data['end_date']} {event_data['end_time']}", '%Y-%m-%d %H:%M')
-            
-            event_string = f"{title} on {start_dt.strftime('%B %d, %Y')} at {start_dt.strftime('%I:%M %p')}"
+            parts = [title, 'on', start_dt.strftime('%B %d, %Y'), 'at', start_dt.strftime('%I:%M %p')]
             
             # Add end time if different day or not exactly 1 hour
             if event_data['start_date'] != event_data['end_date'] or (end_dt - start_dt).seconds != 3600:
                 if event_data['start_date'] == event_data['end_date']:
-                    event_string += f" to {end_dt.strftime('%I:%M %p')}"
+                    parts += ['to', end_dt.strftime('%I:%M %p')]
                 else:
-                    event_string += f" to {end_dt.strftime('%B %d, %Y at %I:%M %p')}"
+                    parts += ['to', end_dt.strftime('%B %d, %Y at %I:%M %p')]
         
         # Add location if specified
         if event_data.get('location'):
-            event_string += f" at {event_data['location']}"
+            parts += ['at', event_data['location']]
         
         # Add calendar specification for Fantastical
         if target_calendar:
-            event_string += f" /{target_calendar}"
+            parts.append(f"/{target_calendar}")
+        
+        # Build from parts and join once rather than growing a string
+        event_string = ' '.join(parts)
         
         logger.info("✨ Generated Fantastical natural language string")
         logger.info(f"🎯 FANTASTICAL SENTENCE: '{event_string}'")
@@ -253,149 +541,78 @@ def create_fantastical_string(event_data, target_calendar, logger):
         logger.error(f"Failed to generate Fantastical string: {str(e)}")
         return None
 
-def create_fantastical_applescript(fantastical_string, event_data, user_input, target_calendar, logger):
-    """Generate AppleScript for Fantastical using natural language string."""
+def script_path(name):
+    """Return the precompiled .scpt for name, falling back to its source."""
+    compiled = os.path.join(WORKFLOW_DIR, f"{name}.scpt")
+    if os.path.exists(compiled):
+        return compiled
+    return os.path.join(WORKFLOW_DIR, f"{name}.applescript")
+
+def create_focal_notes(event_data, user_input):
+    """Combine the event notes with FOCAL attribution."""
+    # Add FOCAL attribution with timestamp and original instruction
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    focal_attribution = f"Created by FOCAL on {timestamp}\nOriginal: \"{user_input}\""
+    
+    if event_data.get('notes'):
+        return f"{event_data['notes']}\n\n{focal_attribution}"
+    return focal_attribution
+
+def create_fantastical_script_args(fantastical_string, event_data, user_input, target_calendar, logger):
+    """Generate the fantastical_event script arguments from the natural language string."""
     try:
-        # Add FOCAL attribution with timestamp and original instruction
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Escape user input for AppleScript
-        escaped_user_input = user_input.replace('"', '\\"').replace('\\', '\\\\')
-        focal_attribution = f"Created by FOCAL on {timestamp}\\nOriginal: \"{escaped_user_input}\""
-        
-        if event_data.get('notes'):
-            notes = f"{event_data['notes']}\\n\\n{focal_attribution}"
-        else:
-            notes = focal_attribution
-        
-        # Escape quotes in the fantastical string and notes for AppleScript
-        escaped_fantastical_string = fantastical_string.replace('"', '\\"')
-        escaped_notes = notes.replace('"', '\\"')
+        # Calendar is in the sentence; values go in as argv, so no escaping is needed
+        args = [fantastical_string, create_focal_notes(event_data, user_input)]
         
-        # Build AppleScript for Fantastical with notes (calendar is now in the sentence)
-        applescript = f'''tell application "Fantastical"
-    parse sentence "{escaped_fantastical_string}" notes "{escaped_notes}" with add immediately
-end tell'''
+        logger.info("🚀 Generated AppleScript arguments for Fantastical")
+        logger.debug(f"AppleScript arguments: {args}")
         
-        logger.info("🚀 Generated AppleScript for Fantastical")
-        logger.debug(f"Generated AppleScript: {applescript}")
-        
-        return applescript
+        return args
         
     except Exception as e:
-        logger.error(f"Failed to generate Fantastical AppleScript: {str(e)}")
+        logger.error(f"Failed to generate Fantastical AppleScript arguments: {str(e)}")
         return None
 
-def create_calendar_applescript(event_data, user_input, target_calendar, logger):
-    """Generate AppleScript for Apple Calendar using structured data."""
+def create_calendar_script_args(event_data, user_input, target_calendar, logger):
+    """Generate the calendar_event script arguments from structured data."""
     try:
-        # Handle null values and add FOCAL attribution
-        location = event_data.get('location') or ''
-        notes = event_data.get('notes') or ''
-        recurrence = event_data.get('recurrence')
-        
-        # Add FOCAL attribution with timestamp and original instruction
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Escape user input for AppleScript
-        escaped_user_input = user_input.replace('"', '\\"').replace('\\', '\\\\')
-        focal_attribution = f"Created by FOCAL on {timestamp}\\nOriginal: \"{escaped_user_input}\""
-        
-        if notes:
-            notes = f"{notes}\\n\\n{focal_attribution}"
-        else:
-            notes = focal_attribution
-        
-        # Escape quotes in strings for AppleScript
-        title = event_data['title'].replace('"', '\\"')
-        location = location.replace('"', '\\"')
-        notes = notes.replace('"', '\\"')
-        calendar_name = target_calendar.replace('"', '\\"')
+        # All-day events start and end at midnight
+        start_dt, end_dt = event_datetimes(event_data)
         
-        # Month names for AppleScript (must use constants, not numbers)
-        month_names = {
-            1: "January", 2: "February", 3: "March", 4: "April",
-            5: "May", 6: "June", 7: "July", 8: "August",
-            9: "September", 10: "October", 11: "November", 12: "December"
-        }
+        # Values go in as argv, so no AppleScript escaping is needed
+        args = [
+            target_calendar,
+            event_data['title'],
+            event_data.get('location') or '',
+            create_focal_notes(event_data, user_input),
+            'true' if event_data['all_day'] else 'false',
+        ]
+        for dt in (start_dt, end_dt):
+            args += [str(dt.year), str(dt.month), str(dt.day), str(dt.hour), str(dt.minute)]
         
-        # Parse dates and times for both all-day and timed events
-        start_dt = datetime.strptime(event_data['start_date'], "%Y-%m-%d")
-        end_dt = datetime.strptime(event_data['end_date'], "%Y-%m-%d")
+        logger.info("🚀 Generated structured AppleScript arguments for Apple Calendar")
+        logger.debug(f"AppleScript arguments: {args}")
         
-        if event_data['all_day']:
-            # All-day events: use dates only
-            applescript = f'''tell application "Calendar"
-    tell calendar "{calendar_name}"
-        set startDate to (current date)
-        set year of startDate to {start_dt.year}
-        set month of startDate to {month_names[start_dt.month]}
-        set day of startDate to {start_dt.day}
-        set hours of startDate to 0
-        set minutes of startDate to 0
-        set seconds of startDate to 0
-        
-        set endDate to (current date)
-        set year of endDate to {end_dt.year}
-        set month of endDate to {month_names[end_dt.month]}
-        set day of endDate to {end_dt.day}
-        set hours of endDate to 0
-        set minutes of endDate to 0
-        set seconds of endDate to 0
-        
-        make new event at end with properties {{summary: "{title}", start date: startDate, end date: endDate, allday event: true'''
-        else:
-            # Timed events: parse dates and times
-            start_dt_full = datetime.strptime(f"{event_data['start_date']} {event_data['start_time']}", "%Y-%m-%d %H:%M")
-            end_dt_full = datetime.strptime(f"{event_data['end_date']} {event_data['end_time']}", "%Y-%m-%d %H:%M")
-            
-            applescript = f'''tell application "Calendar"
-    tell calendar "{calendar_name}"
-        set startDate to (current date)
-        set year of startDate to {start_dt_full.year}
-        set month of startDate to {month_names[start_dt_full.month]}
-        set day of startDate to {start_dt_full.day}
-        set hours of startDate to {start_dt_full.hour}
-        set minutes of startDate to {start_dt_full.minute}
-        set seconds of startDate to 0
-        
-        set endDate to (current date)
-        set year of endDate to {end_dt_full.year}
-        set month of endDate to {month_names[end_dt_full.month]}
-        set day of endDate to {end_dt_full.day}
-        set hours of endDate to {end_dt_full.hour}
-        set minutes of endDate to {end_dt_full.minute}
-        set seconds of endDate to 0
-        
-        make new event at end with properties {{summary: "{title}", start date: startDate, end date: endDate'''
-        
-        if location:
-            applescript += f', location: "{location}"'
-        
-        # Always add notes since we include FOCAL attribution
-        applescript += f', description: "{notes}"'
-        
-        applescript += '}\n    end tell\nend tell'
-        
-        logger.info("🚀 Generated structured AppleScript for Apple Calendar")
-        logger.debug(f"Generated AppleScript: {applescript}")
-        
-        return applescript
+        return args
         
     except Exception as e:
-        logger.error(f"Failed to generate AppleScript: {str(e)}")
+        logger.error(f"Failed to generate AppleScript arguments: {str(e)}")
         return None
 
-def execute_applescript(applescript, calendar_app, logger):
-    """Execute the AppleScript to create event in the specified calendar app."""
+def execute_applescript(script_name, args, calendar_app, logger):
+    """Run a workflow AppleScript with args to create the event in the calendar app."""
     try:
         app_name = "Fantastical" if calendar_app == "fantastical" else "Apple Calendar"
+        path = script_path(script_name)
         logger.info(f"Executing AppleScript in {app_name}")
-        logger.debug(f"AppleScript to execute: {applescript}")
+        logger.debug(f"AppleScript to execute: {path}")
         
         result = subprocess.run(
-            ['osascript', '-e', applescript],
+            [OSASCRIPT, path, *args],
             capture_output=True,
             text=True,
-            timeout=30
+            timeout=30,
+            close_fds=False
         )
         
         logger.info(f"AppleScript execution completed with return code: {result.returncode}")
@@ -417,28 +634,145 @@ def execute_applescript(applescript, calendar_app, logger):
         logger.error(f"Subprocess error executing AppleScript: {str(e)}")
         return False
 
+def launch_calendar_app(calendar_app, logger):
+    """Start the calendar app in the background while OpenAI is working."""
+    app = "Fantastical" if calendar_app == "fantastical" else "Calendar"
+    try:
+        return subprocess.Popen(
+            [OSASCRIPT, '-e', f'tell application "{app}" to launch'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=False
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not launch {app} in the background: {str(e)}")
+        return None
+
+def wait_for_launch(launcher, logger):
+    """Wait for the background app launch to finish, if one was started."""
+    if launcher is None:
+        return
+    try:
+        launcher.wait(timeout=APP_LAUNCH_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        logger.warning("Calendar app is still launching, continuing anyway")
+
+def create_calendar_events(events, user_inputs, calendar_app, target_calendar, logger):
+    """Create every extracted event; returns the number that failed."""
+    def create(pair):
+        user_input, event_data = pair
+        # Batch API results can fail individually; count those as failures
+        return bool(event_data) and create_calendar_event(event_data, user_input, calendar_app, target_calendar, logger)
+    
+    pairs = list(zip(user_inputs, events))
+    if len(pairs) == 1:
+        results = [create(pairs[0])]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EVENTS) as pool:
+            results = list(pool.map(create, pairs))
+    return results.count(False)
+
 def sanitize_input(text):
     """Basic input sanitization to prevent injection attacks."""
-    # Limit length
-    if len(text) > 500:
-        text = text[:500]
-    # Remove potentially dangerous characters
-    text = text.replace('\\', '').replace('"', "'")
-    return text.strip()
+    # Limit length, then remove potentially dangerous characters in one pass
+    return text[:500].translate(SANITIZE_TABLE).strip()
+
+def request_extraction(user_inputs, api_key, logger):
+    """Get OpenAI's JSON for user_inputs; returns (json_response, key to store or None)."""
+    if len(user_inputs) == 1:
+        prompt = create_extraction_prompt(user_inputs[0])
+    else:
+        prompt = create_batch_extraction_prompt(user_inputs)
+    logger.debug(f"Created extraction prompt for OpenAI")
+    
+    # The answer for "in 2 hours" changes during the day, so never reuse it
+    if any(TIME_RELATIVE_RE.search(text) for text in user_inputs):
+        return extract_event_data(prompt, api_key, logger, len(user_inputs)), None
+    
+    # Imported here so locally parsed events never load hashlib and sqlite3
+    from response_cache import cache_key, get_cached_response
+    
+    # Everything else only depends on today's date, not the minute in the prompt
+    response_key = cache_key(
+        get_model(),
+        "\n".join([SYSTEM_MESSAGE, datetime.now().date().isoformat(), *user_inputs])
+    )
+    json_response = get_cached_response(response_key)
+    if json_response is not None:
+        logger.info("⚡ Using cached OpenAI response")
+        return json_response, None
+    return extract_event_data(prompt, api_key, logger, len(user_inputs)), response_key
+
+def create_calendar_event(event_data, user_input, calendar_app, target_calendar, logger):
+    """Build the arguments and run the AppleScript for one event in the chosen app."""
+    app_name = "Fantastical" if calendar_app == "fantastical" else "Apple Calendar"
+    
+    # Generate AppleScript based on calendar app choice
+    logger.info(f"🔄 Generating AppleScript for {app_name}...")
+    if calendar_app == "fantastical":
+        # Generate natural language string for Fantastical
+        logger.info("📝 Creating natural language string for Fantastical NLP...")
+        fantastical_string = create_fantastical_string(event_data, target_calendar, logger)
+        if not fantastical_string:
+            logger.error("Failed to generate Fantastical string")
+            return False
+        
+        logger.info("📋 Converting to Fantastical AppleScript arguments...")
+        script_name = 'fantastical_event'
+        args = create_fantastical_script_args(fantastical_string, event_data, user_input, target_calendar, logger)
+    else:
+        # Generate structured arguments for Apple Calendar
+        logger.info("🔧 Creating structured AppleScript arguments for Apple Calendar...")
+        script_name = 'calendar_event'
+        args = create_calendar_script_args(event_data, user_input, target_calendar, logger)
+    
+    if not args:
+        logger.error("Failed to generate AppleScript arguments")
+        return False
+    
+    # Execute AppleScript
+    logger.info("Attempting to execute AppleScript")
+    return execute_applescript(script_name, args, calendar_app, logger)
 
 def main():
     logger = setup_logging()
     logger.info("FOCAL starting up")
     
-    if len(sys.argv) < 2:
+    # "--force-ai" sends every description to OpenAI, skipping the local parser
+    args = sys.argv[1:]
+    force_ai = bool(args) and args[0] == '--force-ai'
+    if force_ai:
+        args = args[1:]
+    
+    if not args:
         logger.error("No event description provided")
         print("Error: No event description provided")
         sys.exit(1)
     
-    user_input = sanitize_input(sys.argv[1])
-    logger.info(f"Processing user input: '{user_input}'")
+    # Each argument is one event description; Alfred passes exactly one.
+    # "--batch FILE" reads one description per line and uses the Batch API.
+    use_batch_api = args[0] == '--batch'
+    if use_batch_api:
+        if len(args) != 2:
+            logger.error("Usage: create_event.py [--force-ai] --batch FILE")
+            print("Error: Usage: create_event.py [--force-ai] --batch FILE")
+            sys.exit(1)
+        try:
+            with open(args[1], 'r') as f:
+                descriptions = [line for line in f.read().splitlines() if line.strip()]
+        except (FileNotFoundError, IOError) as e:
+            logger.error(f"Could not read batch file: {str(e)}")
+            print(f"Error: Could not read batch file {args[1]}")
+            sys.exit(1)
+    else:
+        descriptions = args
+    
+    user_inputs = [sanitize_input(text) for text in descriptions]
+    for user_input in user_inputs:
+        logger.info(f"Processing user input: '{user_input}'")
     
-    if not user_input:
+    if not user_inputs or not all(user_inputs):
         logger.error("Invalid event description after sanitization")
         print("Error: Invalid event description")
         sys.exit(1)
@@ -457,61 +791,83 @@ def main():
     
     logger.info("API key found, proceeding with event generation")
     
-    # Extract structured event data using OpenAI
-    prompt = create_extraction_prompt(user_input)
-    logger.debug(f"Created extraction prompt for OpenAI")
-    
-    json_response = extract_event_data(prompt, api_key, logger)
+    # Simple phrasings are parsed locally without an OpenAI round-trip
+    if force_ai:
+        events = [None] * len(user_inputs)
+    else:
+        events = [fast_parse_event(user_input) for user_input in user_inputs]
+    for event_data in events:
+        if event_data:
+            logger.info("⚡ Parsed event locally, skipping OpenAI")
+            logger.info(f"🔍 LOCALLY PARSED EVENT: {json.dumps(event_data)}")
     
-    if not json_response:
-        logger.error("Failed to get response from OpenAI")
-        print("Error: Failed to process event with OpenAI")
-        sys.exit(1)
+    pending = [i for i, event_data in enumerate(events) if event_data is None]
     
-    # Parse and validate the extracted data
-    event_data = parse_and_validate_event_data(json_response, logger)
+    # Overlap the calendar app's cold start with the OpenAI round-trip
+    launcher = launch_calendar_app(calendar_app, logger) if pending else None
     
-    if not event_data:
-        logger.error("Failed to parse or validate event data")
-        print("Error: Failed to extract valid event data")
-        sys.exit(1)
+    if pending and use_batch_api:
+        # Bulk imports trade latency for the Batch API's lower price
+        extracted = extract_with_batch_api([user_inputs[i] for i in pending], api_key, logger)
+        if extracted is None:
+            print("Error: Failed to process events with the OpenAI Batch API")
+            sys.exit(1)
+        
+        for i, event_data in zip(pending, extracted):
+            events[i] = event_data
+    elif pending:
+        # Extract structured event data using OpenAI, one request for all
+        # descriptions the fast path could not handle
+        try:
+            json_response, response_key = request_extraction([user_inputs[i] for i in pending], api_key, logger)
+        except Exception as e:
+            # Show OpenAI's own message (unknown model, no JSON mode, bad key, ...)
+            logger.error(f"OpenAI API call failed: {str(e)}")
+            print(f"Error: Failed to process event with OpenAI: {str(e)}")
+            sys.exit(1)
+        
+        if not json_response:
+            logger.error("Failed to get response from OpenAI")
+            print("Error: Failed to process event with OpenAI")
+            sys.exit(1)
+        
+        # Parse and validate the extracted data
+        if len(pending) == 1:
+            extracted = [parse_and_validate_event_data(json_response, logger)]
+        else:
+            extracted = parse_and_validate_batch_event_data(json_response, len(pending), logger)
+        
+        if not extracted or not all(extracted):
+            logger.error("Failed to parse or validate event data")
+            print("Error: Failed to extract valid event data")
+            sys.exit(1)
+        
+        if response_key:
+            from response_cache import store_response
+            store_response(response_key, json_response)
+        
+        for i, event_data in zip(pending, extracted):
+            events[i] = event_data
     
     # Get target calendar for both apps
     target_calendar = get_target_calendar()
     logger.info(f"📅 Target calendar: {target_calendar}")
     
-    # Generate AppleScript based on calendar app choice
-    logger.info(f"🔄 Generating AppleScript for {app_name}...")
-    if calendar_app == "fantastical":
-        # Generate natural language string for Fantastical
-        logger.info("📝 Creating natural language string for Fantastical NLP...")
-        fantastical_string = create_fantastical_string(event_data, target_calendar, logger)
-        if not fantastical_string:
-            logger.error("Failed to generate Fantastical string")
-            print("Error: Failed to generate event string")
-            sys.exit(1)
-        
-        logger.info("📋 Converting to Fantastical AppleScript...")
-        applescript = create_fantastical_applescript(fantastical_string, event_data, user_input, target_calendar, logger)
-    else:
-        # Generate structured AppleScript for Apple Calendar
-        logger.info("🔧 Creating structured AppleScript for Apple Calendar...")
-        applescript = create_calendar_applescript(event_data, user_input, target_calendar, logger)
-    
-    if not applescript:
-        logger.error("Failed to generate AppleScript")
-        print("Error: Failed to generate event script")
-        sys.exit(1)
+    wait_for_launch(launcher, logger)
+    failed = create_calendar_events(events, user_inputs, calendar_app, target_calendar, logger)
     
-    # Execute AppleScript
-    logger.info("Attempting to execute AppleScript")
-    app_name = "Fantastical" if calendar_app == "fantastical" else "Apple Calendar"
-    if execute_applescript(applescript, calendar_app, logger):
+    if not failed:
         logger.info("Event created successfully!")
-        print("Event created successfully!")
+        if len(events) == 1:
+            print("Event created successfully!")
+        else:
+            print(f"{len(events)} events created successfully!")
     else:
-        logger.error(f"Failed to create event in {app_name}")
-        print(f"Error: Failed to create event in {app_name}")
+        logger.error(f"Failed to create {failed} of {len(events)} event(s) in {app_name}")
+        if len(events) == 1:
+            print(f"Error: Failed to create event in {app_name}")
+        else:
+            print(f"Error: Failed to create {failed} of {len(events)} events in {app_name}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -5,8 +5,30 @@ import subprocess
 import os
 import sys
 
+def get_calendars_in_process():
+    """Get calendar names via ScriptingBridge, or None if pyobjc is unavailable."""
+    try:
+        from ScriptingBridge import SBApplication
+    except ImportError:
+        return None
+    
+    try:
+        calendar_app = SBApplication.applicationWithBundleIdentifier_("com.apple.iCal")
+        if calendar_app is None:
+            return None
+        return [name for name in (cal.name() for cal in calendar_app.calendars()) if name]
+    except Exception as e:
+        print(f"ScriptingBridge failed, falling back to osascript: {e}", file=sys.stderr)
+        return None
+
 def get_available_calendars():
     """Get list of calendars from Apple Calendar."""
+    # In-process when pyobjc is installed, saving the osascript spawn;
+    # an empty result (e.g. automation not yet allowed) retries via osascript
+    calendars = get_calendars_in_process()
+    if calendars:
+        return calendars
+    
     script_path = os.path.join(os.path.dirname(__file__), 'get_calendars.applescript')
     
     try:
@@ -18,12 +40,8 @@ def get_available_calendars():
         )
         
         if result.returncode == 0:
-            # Parse the output - AppleScript returns as comma-separated list
-            output = result.stdout.strip()
-            if output:
-                # Clean up the AppleScript list format
-                calendars = [cal.strip() for cal in output.split(',')]
-                return calendars
+            # The script returns one calendar name per line
+            return list(filter(None, map(str.strip, result.stdout.splitlines())))
         return []
     except Exception as e:
         print(f"Error getting calendars: {e}", file=sys.stderr)
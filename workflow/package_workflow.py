@@ -4,13 +4,64 @@ AI-powered packaging script for FOCAL Alfred workflow with dynamic versioning.
 """
 
 import os
+import re
 import sys
 import zipfile
 import shutil
 import json
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# <key>version</key> followed by <string>X.Y.Z</string> in info.plist
+PLIST_VERSION_RE = re.compile(r'<key>version</key>\s*<string>([^<]+)</string>')
+TAG_VERSION_RE = re.compile(r'(\d+\.\d+\.\d+)')
+
+# Bytecode caches are rebuilt by Python on first run, so don't ship them
+SKIP_DIRS = frozenset({'__pycache__'})
+SKIP_EXTS = frozenset({'.pyc', '.pyo'})
+
+# Files to include
+WORKFLOW_FILES = [
+    'info.plist',
+    'create_event.py',
+    'response_cache.py',
+    'configure.py',
+    'get_calendars.py',
+    'get_calendars.applescript',
+    'calendar_event.applescript',
+    'calendar_event.scpt',
+    'fantastical_event.applescript',
+    'fantastical_event.scpt',
+    'icon.png',
+]
+
+# Config files written by install.sh, merged into one file in the package
+CONFIG_FILES = {
+    '.openai_key': 'api_key',
+    '.calendar_app': 'calendar_app',
+    '.target_calendar': 'target_calendar',
+    '.openai_model': 'model',
+}
+CONFIG_NAME = '.focal.json'
+
+MANIFEST_NAME = '.manifest.json'
+
+# Signatures of formats that are already compressed (PNG, zip/wheel, gzip);
+# deflating them again costs time for no size gain
+COMPRESSED_MAGIC = (b'\x89PNG', b'PK\x03\x04', b'\x1f\x8b')
+
+# Extensions that settle the choice without opening the file; others are
+# sniffed. Native libraries still shrink by half or more under deflate.
+STORED_EXTS = frozenset({'.whl', '.zip', '.gz', '.png', '.jpg', '.jpeg'})
+DEFLATED_EXTS = frozenset({'.py', '.pyi', '.txt', '.json', '.so', '.dylib'})
+
+# Venv files read ahead in background threads while earlier ones compress
+READ_AHEAD_WORKERS = 4
+READ_AHEAD_FILES = 32
+
 def get_version():
     """Get version from info.plist or git tags."""
     workflow_dir = Path(__file__).parent
@@ -20,9 +71,7 @@ def get_version():
         # Read version from info.plist
         if info_plist.exists():
             content = info_plist.read_text()
-            import re
-            # Look for <key>version</key> followed by <string>X.Y.Z</string>
-            version_match = re.search(r'<key>version</key>\s*<string>([^<]+)</string>', content)
+            version_match = PLIST_VERSION_RE.search(content)
             if version_match:
                 version = version_match.group(1)
                 if version != "{{VERSION}}":  # Not a template
@@ -35,7 +84,7 @@ def get_version():
             capture_output=True, text=True, check=True
         )
         tag = result.stdout.strip()
-        version_match = re.search(r'(\d+\.\d+\.\d+)', tag)
+        version_match = TAG_VERSION_RE.search(tag)
         return version_match.group(1) if version_match else "1.0.0"
         
     except Exception as e:
@@ -48,60 +97,177 @@ def process_template_file(src_path, dest_path, version):
     content = content.replace('{{VERSION}}', version)
     dest_path.write_text(content, encoding='utf-8')
 
+def iter_package_files(root):
+    """Yield (path, arcname) for every file under root, skipping caches."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file() and os.path.splitext(entry.name)[1] not in SKIP_EXTS:
+                    yield entry.path, os.path.relpath(entry.path, root)
+
+def is_precompressed(path, head=None):
+    """Check whether a file already holds compressed data."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in STORED_EXTS:
+        return True
+    if ext in DEFLATED_EXTS:
+        return False
+    if head is None:
+        with open(path, 'rb') as f:
+            head = f.read(4)
+    return head.startswith(COMPRESSED_MAGIC)
+
+def read_file(path):
+    """Read a whole file as bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def add_to_zip(zipf, file_path, arcname):
+    """Add a file to the package, storing already-compressed data as is."""
+    compress_type = zipfile.ZIP_STORED if is_precompressed(file_path) else None
+    zipf.write(file_path, arcname, compress_type=compress_type)
+
+def add_data_to_zip(zipf, file_path, arcname, data):
+    """Add already-read file contents to the package with the file's metadata."""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    if is_precompressed(file_path, data[:4]):
+        zipf.writestr(zinfo, data, compress_type=zipfile.ZIP_STORED)
+    else:
+        zipf.writestr(zinfo, data, compress_type=zipfile.ZIP_DEFLATED,
+                      compresslevel=zipf.compresslevel)
+
+def add_files_to_zip(zipf, files):
+    """Add (path, arcname) pairs, reading upcoming files while compressing."""
+    # zlib releases the GIL, so background reads overlap compression; the
+    # bounded queue caps how much file data is held in memory at once
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=READ_AHEAD_WORKERS) as pool:
+        for file_path, arcname in files:
+            pending.append((file_path, arcname, pool.submit(read_file, file_path)))
+            if len(pending) >= READ_AHEAD_FILES:
+                file_path, arcname, data = pending.popleft()
+                add_data_to_zip(zipf, file_path, arcname, data.result())
+        while pending:
+            file_path, arcname, data = pending.popleft()
+            add_data_to_zip(zipf, file_path, arcname, data.result())
+
+def build_venv_fragment(venv_dir, dist_dir, manifest):
+    """Zip the venv on its own, reusing the previous zip when it is unchanged."""
+    # The venv only changes when install.sh rebuilds it, so key the zip on
+    # the venv's (mtime, size) entries plus this script itself
+    prefix = 'venv' + os.sep
+    entries = {k: v for k, v in manifest.items() if k.startswith(prefix) or k == '<package_workflow>'}
+    digest = hashlib.blake2b(json.dumps(entries, sort_keys=True).encode(), digest_size=8).hexdigest()
+    fragment = dist_dir / f"venv_{digest}.zip"
+    
+    # One summary line rather than a line per file
+    count = len(entries) - 1
+    total_mb = sum(size for _, size in entries.values()) / 1024 / 1024
+    if fragment.exists():
+        print(f"  📦 Reusing zipped Python environment ({count} files)")
+        return fragment
+    
+    for stale in dist_dir.glob('venv_*.zip'):
+        stale.unlink()
+    
+    partial = fragment.with_suffix('.tmp')
+    with zipfile.ZipFile(partial, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        add_files_to_zip(zipf, ((file_path, os.path.join('venv', arcname))
+                                for file_path, arcname in iter_package_files(venv_dir)))
+    os.replace(partial, fragment)
+    print(f"  📦 Zipped Python environment: {count} files ({total_mb:.1f} MB)")
+    return fragment
+
+def build_config(workflow_dir):
+    """Combine the individual config files into a single dict."""
+    config = {}
+    for filename, key in CONFIG_FILES.items():
+        try:
+            config[key] = (workflow_dir / filename).read_text().strip()
+        except FileNotFoundError:
+            continue
+    return config
+
+def build_manifest(workflow_dir):
+    """Map each packaged arcname to its (mtime_ns, size) for change detection."""
+    manifest = {}
+    for filename in [*WORKFLOW_FILES, *CONFIG_FILES]:
+        try:
+            st = os.stat(workflow_dir / filename)
+        except FileNotFoundError:
+            continue
+        manifest[filename] = [st.st_mtime_ns, st.st_size]
+    
+    venv_dir = workflow_dir / 'venv'
+    if venv_dir.exists():
+        for file_path, arcname in iter_package_files(venv_dir):
+            st = os.stat(file_path)
+            manifest[os.path.join('venv', arcname)] = [st.st_mtime_ns, st.st_size]
+    
+    # A change to the packaging logic itself must also trigger a rebuild
+    st = os.stat(__file__)
+    manifest['<package_workflow>'] = [st.st_mtime_ns, st.st_size]
+    return manifest
+
+def load_manifest(dist_dir):
+    """Load the manifest recorded by the previous build, if any."""
+    try:
+        with open(dist_dir / MANIFEST_NAME, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, IOError, ValueError):
+        return None
+
 def package_workflow():
     workflow_dir = Path(__file__).parent
     dist_dir = workflow_dir.parent / 'dist'
-    build_dir = workflow_dir / 'build'
     
     # Get dynamic version
     version = get_version()
     print(f"📦 Building FOCAL v{version}")
     
-    # Clean and create directories
-    if build_dir.exists():
-        shutil.rmtree(build_dir)
-    build_dir.mkdir()
-    dist_dir.mkdir(exist_ok=True)
-    
-    # Files to include
-    files = [
-        'info.plist',
-        'create_event.py',
-        'configure.py',
-        'get_calendars.py',
-        'get_calendars.applescript',
-        '.openai_key',
-        '.calendar_app',
-        '.target_calendar',
-        'icon.png',
-    ]
+    # Skip the build entirely when nothing changed since the last package
+    package_name = f"FOCAL_v{version}.alfredworkflow"
+    package_path = dist_dir / package_name
+    manifest = build_manifest(workflow_dir)
+    previous = load_manifest(dist_dir)
+    if (package_path.exists() and previous
+            and previous.get('package') == package_name
+            and previous.get('files') == manifest):
+        print(f"\n✅ Package up to date: {package_path}")
+        return str(package_path)
     
-    # Copy files 
-    for filename in files:
-        src = workflow_dir / filename
-        dest = build_dir / filename
-        if src.exists():
-            shutil.copy2(src, dest)
-            print(f"  ✓ {filename}")
+    dist_dir.mkdir(exist_ok=True)
     
-    # Copy venv if it exists
+    # Start from the zipped venv, read straight from the source tree and
+    # cached across builds, then append the workflow files to it
     venv_dir = workflow_dir / 'venv'
+    mode = 'w'
     if venv_dir.exists():
-        print("  📦 Copying Python environment...")
-        shutil.copytree(venv_dir, build_dir / 'venv', symlinks=True)
+        shutil.copyfile(build_venv_fragment(venv_dir, dist_dir, manifest), package_path)
+        mode = 'a'
     
     # Create workflow package with version
-    package_name = f"FOCAL_v{version}.alfredworkflow"
-    package_path = dist_dir / package_name
-    
-    with zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in build_dir.rglob('*'):
-            if file_path.is_file():
-                arcname = file_path.relative_to(build_dir)
-                zipf.write(file_path, arcname)
+    # Level 1 deflate is several times faster than the default for a small size cost
+    with zipfile.ZipFile(package_path, mode, zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        # Zip straight from the workflow directory, no staging copy
+        for filename in WORKFLOW_FILES:
+            src = workflow_dir / filename
+            if src.exists():
+                add_to_zip(zipf, src, filename)
+                print(f"  ✓ {filename}")
+        
+        # One config file means one read at runtime instead of three
+        config = build_config(workflow_dir)
+        zipf.writestr(CONFIG_NAME, json.dumps(config))
+        print(f"  ✓ {CONFIG_NAME} ({', '.join(config) or 'defaults'})")
     
-    # Clean up build directory
-    shutil.rmtree(build_dir)
+    with open(dist_dir / MANIFEST_NAME, 'w') as f:
+        json.dump({'package': package_name, 'files': manifest}, f)
     
     print(f"\n✅ Package created: {package_path}")
     print(f"   Size: {package_path.stat().st_size / 1024 / 1024:.1f} MB")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""On-disk cache of OpenAI extractions for repeated descriptions on the same day."""
+
+import os
+import time
+import hashlib
+import sqlite3
+
+CACHE_FILE = os.path.expanduser('~/.focal_cache')
+
+# Keys combine the model, system message, today's date and the descriptions,
+# so an entry can only match again on the day it was stored. Rows older than
+# that can never hit, so they are pruned.
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+def cache_key(model, request):
+    """Build the cache key for a model and request text."""
+    return hashlib.sha256(f"{model}\n{request}".encode('utf-8')).hexdigest()
+
+def _connect():
+    """Open the cache database, creating the table on first use."""
+    conn = sqlite3.connect(CACHE_FILE, timeout=1)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, json TEXT, ts INTEGER)'
+    )
+    return conn
+
+def get_cached_response(key):
+    """Return the cached JSON response for key, or None on miss or error."""
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                'SELECT json FROM cache WHERE key = ? AND ts > ?',
+                (key, int(time.time()) - CACHE_TTL_SECONDS)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+def store_response(key, json_response):
+    """Store a validated JSON response and prune expired entries."""
+    now = int(time.time())
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, json, ts) VALUES (?, ?, ?)',
+                    (key, json_response, now)
+                )
+                conn.execute('DELETE FROM cache WHERE ts <= ?', (now - CACHE_TTL_SECONDS,))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass